@@ -12,6 +12,7 @@ Tools → Fill selected from Bunpro, to fetch and fill all selected notes at onc
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Optional, Sequence
 
 from aqt import gui_hooks, mw
@@ -35,6 +36,9 @@ FIELD_EX2_JA = "ex2_ja"
 FIELD_EX2_JA_FURIGANA = "ex2_ja_furigana"
 FIELD_EX2_EN = "ex2_en"
 
+# Bunpro fetches are network-bound; batch fills issue them from a small pool.
+MAX_FETCH_WORKERS = 8
+
 FIELD_ORDER = [
     FIELD_KANJI,
     FIELD_KANA,
@@ -67,12 +71,29 @@ def _set_field_if_present(editor, name_to_index: dict, field_name: str, value: s
         editor.note.fields[idx] = value
 
 
+# Field layouts are invariant per note type, so batch fills reuse one dict
+# per model instead of rebuilding it for every note. Cleared when a new
+# collection is loaded, since note type ids are per-collection.
+_NAME_TO_INDEX_CACHE: dict = {}
+
+
 def _name_to_index_for_note(note) -> Optional[dict]:
-    """Return field name -> index for the note's model."""
+    """Return field name -> index for the note's model (cached by model id)."""
+    mid = note.mid
+    hit = _NAME_TO_INDEX_CACHE.get(mid)
+    if hit is not None:
+        return hit
     model = note.note_type()
     if not model or not model.get("flds"):
         return None
-    return {fld["name"]: i for i, fld in enumerate(model["flds"])}
+    out = {fld["name"]: i for i, fld in enumerate(model["flds"])}
+    _NAME_TO_INDEX_CACHE[mid] = out
+    return out
+
+
+def _clear_field_index_cache(*_args) -> None:
+    """Drop cached field layouts when a (different) collection is loaded."""
+    _NAME_TO_INDEX_CACHE.clear()
 
 
 def _set_note_field(note, name_to_index: dict, field_name: str, value: str) -> None:
@@ -98,6 +119,17 @@ def _jlpt_tag_for_level(level: Optional[str]) -> Optional[str]:
     return "JLPT_N1"
 
 
+def _looks_japanese(s: str) -> bool:
+    """True if the string contains any kana or kanji.
+
+    Fields holding typos or English placeholders can't match a Bunpro vocab
+    page, so they aren't worth a network round-trip.
+    """
+    return any(
+        "\u3040" <= c <= "\u30ff" or "\u4e00" <= c <= "\u9fff" for c in s
+    )
+
+
 def _normalize_pos(pos: str) -> str:
     """Map JMdict adj-f (prenominal adjective) to 'adj'; keep adj-i and adj-na as-is."""
     if not pos:
@@ -123,11 +155,8 @@ def _fill_note_from_vocab(note, name_to_index: dict, kanji: str, vocab: Any) ->
             _set_note_field(note, name_to_index, FIELD_EX2_JA_FURIGANA, ja_furi)
             _set_note_field(note, name_to_index, FIELD_EX2_EN, en)
     tag = _jlpt_tag_for_level(vocab.jlpt_level)
-    if tag:
-        tags = list(note.tags)
-        if tag not in tags:
-            tags.append(tag)
-            note.tags = tags
+    if tag and not note.has_tag(tag):
+        note.add_tag(tag)
 
 
 def _on_bunpro_fetch(editor) -> None:
@@ -147,6 +176,9 @@ def _on_bunpro_fetch(editor) -> None:
     if not kanji:
         tooltip("Enter kanji in the kanji field first.")
         return
+    if not _looks_japanese(kanji):
+        tooltip("The kanji field doesn't look like Japanese.")
+        return
 
     vocab = fetch_vocab(kanji)
     if not vocab:
@@ -170,19 +202,30 @@ def _add_bunpro_button(buttons: list, editor) -> None:
     buttons.append(b)
 
 
-def _run_bunpro_batch(note_ids: Sequence[int]) -> tuple:
-    """Fill notes from Bunpro. Returns (filled_count, skipped_no_kanji, skipped_not_found)."""
-    col = mw.col
-    if not col:
-        return 0, 0, 0
-    filled = 0
+def _collect_batch_targets(col, note_ids: Sequence[int]) -> tuple:
+    """Load and validate notes for a batch fill.
+
+    Returns ([(note, name_to_index, kanji)], skipped_no_kanji).
+    """
+    pending: list = []
     skipped_no_kanji = 0
-    skipped_not_found = 0
-    for nid in note_ids:
+    # One bulk read when the running Anki exposes it, instead of a backend
+    # round-trip per selected note.
+    if hasattr(col, "get_notes"):
         try:
-            note = col.get_note(nid)
+            notes = list(col.get_notes(list(note_ids)))
         except Exception:
-            continue
+            notes = None
+    else:
+        notes = None
+    if notes is None:
+        notes = []
+        for nid in note_ids:
+            try:
+                notes.append(col.get_note(nid))
+            except Exception:
+                continue
+    for note in notes:
         name_to_index = _name_to_index_for_note(note)
         if not name_to_index:
             continue
@@ -191,16 +234,98 @@ def _run_bunpro_batch(note_ids: Sequence[int]) -> tuple:
             skipped_no_kanji += 1
             continue
         kanji = (note.fields[kanji_idx] or "").strip()
-        if not kanji:
+        if not kanji or not _looks_japanese(kanji):
             skipped_no_kanji += 1
             continue
-        vocab = fetch_vocab(kanji)
+        pending.append((note, name_to_index, kanji))
+    return pending, skipped_no_kanji
+
+
+def _fetch_all(pending: list, on_progress=None) -> list:
+    """Fetch Bunpro data for each (note, name_to_index, kanji) concurrently.
+
+    Network-only: workers never touch the collection. `on_progress` (if
+    given) is called with (done, total) after each fetch; returning False
+    stops the batch early. Returns [(note, name_to_index, kanji, vocab_or_None)].
+    """
+    # Selections often repeat a kanji (re-filling a deck); fetch each unique
+    # word once and fan the result out to every note that wants it.
+    unique = {kanji for _, _, kanji in pending}
+    vocab_by_kanji: dict = {}
+    total = len(unique)
+    done = 0
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as ex:
+        futures = {ex.submit(fetch_vocab, kanji): kanji for kanji in unique}
+        for fut in as_completed(futures):
+            kanji = futures[fut]
+            try:
+                vocab_by_kanji[kanji] = fut.result()
+            except Exception:
+                vocab_by_kanji[kanji] = None
+            done += 1
+            if on_progress and not on_progress(done, total):
+                for f in futures:
+                    f.cancel()
+                break
+    return [
+        (note, name_to_index, kanji, vocab_by_kanji[kanji])
+        for note, name_to_index, kanji in pending
+        if kanji in vocab_by_kanji
+    ]
+
+
+def _apply_all(col, fetched: list) -> tuple:
+    """Fill notes from fetch results and flush them in one bulk write.
+
+    Returns (filled, skipped_not_found).
+    """
+    filled = 0
+    skipped_not_found = 0
+    updated: list = []
+    for note, name_to_index, kanji, vocab in fetched:
         if not vocab:
             skipped_not_found += 1
             continue
         _fill_note_from_vocab(note, name_to_index, kanji, vocab)
-        col.update_note(note)
+        updated.append(note)
         filled += 1
+    if updated:
+        if hasattr(col, "update_notes"):
+            col.update_notes(updated)
+        else:
+            for note in updated:
+                col.update_note(note)
+    return filled, skipped_not_found
+
+
+def _run_bunpro_batch(note_ids: Sequence[int]) -> tuple:
+    """Fill notes from Bunpro. Returns (filled_count, skipped_no_kanji, skipped_not_found)."""
+    col = mw.col
+    if not col:
+        return 0, 0, 0
+    pending, skipped_no_kanji = _collect_batch_targets(col, note_ids)
+
+    # Progress updates (and the cancel check) must run on the main thread;
+    # the flag is read on the next completed fetch, so cancel lags at most
+    # one request.
+    cancelled = {"flag": False}
+
+    def on_progress(done: int, total: int) -> bool:
+        def update() -> None:
+            try:
+                mw.progress.update(
+                    label=f"Fill from Bunpro: {done}/{total}", value=done, max=total
+                )
+                if mw.progress.want_cancel():
+                    cancelled["flag"] = True
+            except Exception:
+                pass
+
+        mw.taskman.run_on_main(update)
+        return not cancelled["flag"]
+
+    fetched = _fetch_all(pending, on_progress)
+    filled, skipped_not_found = _apply_all(col, fetched)
     return filled, skipped_no_kanji, skipped_not_found
 
 
@@ -255,6 +380,7 @@ def _browser_context_menu(browser, menu) -> None:
 
 
 gui_hooks.editor_did_init_buttons.append(_add_bunpro_button)
+gui_hooks.collection_did_load.append(_clear_field_index_cache)
 gui_hooks.browser_will_show_context_menu.append(_browser_context_menu)
 _action_fill_bunpro = QAction("Fill selected from Bunpro", mw)
 qconnect(_action_fill_bunpro.triggered, _on_tools_fill_from_bunpro)
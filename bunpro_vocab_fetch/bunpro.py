@@ -3,17 +3,102 @@
 
 from __future__ import annotations
 
+import io
 import json
+import os
+import pickle
 import re
+import sqlite3
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
 from typing import List, Optional
 
+# Optional connection pooling (requests ships with Anki). With a shared
+# Session, batch fetches reuse warm TLS connections to bunpro.jp instead of
+# paying the TCP+TLS handshake on every word.
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+# Optional fast JSON (orjson also ships with Anki); parses UTF-8 bytes
+# directly without a separate decode pass.
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional streaming JSON: only props.pageProps is ever read, so ijson (when
+# installed) avoids materializing the rest of the __NEXT_DATA__ tree.
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) compatible; Anki Bunpro Vocab Fetch"
 
+# Patterns are compiled once here; the content helpers run per example
+# sentence, so per-call re.compile overhead adds up on batch fills.
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPAN_RE = re.compile(r"<span[^>]*>.*?</span>", re.IGNORECASE | re.DOTALL)
+# One pass over sentence content: blank placeholder (span-wrapped or bare),
+# ruby base+reading, or a bare reading group. Used by _convert_content.
+# The ruby base must be kanji or katakana so we don't group particles
+# (の, は) with the word.
+_CONTENT_TOKEN_RE = re.compile(
+    r"<span[^>]*>____</span>|____|([\u4e00-\u9fff\u30a0-\u30ff]+)（([^）]+)）|（[^）]+）",
+    re.IGNORECASE,
+)
+
+# The page is 200-500 KB but we only need the __NEXT_DATA__ <script> body,
+# which sits well before the end; streaming lets us stop reading early.
+_CHUNK_SIZE = 16384
+_NEXT_DATA_MARKER = b'__NEXT_DATA__" type="application/json">'
+_SCRIPT_END = b"</script>"
+
+CACHE_TTL_SECS = 30 * 86400
+
+# Be polite to bunpro.jp on batch fills: each worker waits this long before
+# a network fetch, and a 429 response is retried once after Retry-After.
+MIN_REQUEST_INTERVAL = 0.1
+_MAX_RETRY_AFTER = 30.0
+
+
+def _retry_after_secs(value: Optional[str]) -> float:
+    """Parse a Retry-After header value (seconds), clamped to a sane maximum."""
+    try:
+        return min(float(value), _MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _scan_next_data(chunks) -> Optional[bytes]:
+    """Accumulate byte chunks until the __NEXT_DATA__ JSON blob is complete.
+
+    Returns the raw JSON bytes, or None if the marker never shows up.
+    """
+    buf = bytearray()
+    start = -1
+    for chunk in chunks:
+        if not chunk:
+            break
+        buf.extend(chunk)
+        if start < 0:
+            start = buf.find(_NEXT_DATA_MARKER)
+        if start >= 0:
+            end = buf.find(_SCRIPT_END, start + len(_NEXT_DATA_MARKER))
+            if end >= 0:
+                return bytes(buf[start + len(_NEXT_DATA_MARKER) : end])
+    return None
+
 
 @dataclass
 class BunproVocab:
@@ -32,9 +117,38 @@ def _strip_html(text: str) -> str:
     """Remove HTML tags and decode common entities."""
     if not text:
         return ""
-    text = re.sub(r"<[^>]+>", "", text)
-    text = text.replace("&nbsp;", " ").strip()
-    return text
+    # Most translations carry no markup at all; skip the regex for those.
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    return text.replace("&nbsp;", " ").strip()
+
+
+def _convert_content(content: str, word: str, with_furigana: bool) -> str:
+    """Single-pass conversion of Bunpro sentence content.
+
+    Handles all three token kinds in one scan: the ____ blank (plain or
+    wrapped in a <span>) becomes the word, 漢字（reading） becomes <ruby>
+    markup or just the base, and bare （...） groups are dropped in plain
+    output (the furigana path leaves them, matching historical behavior).
+    """
+
+    def repl(m) -> str:
+        base = m.group(1)
+        if base:  # 漢字（reading）
+            if with_furigana:
+                return f"<ruby>{base}<rt>{m.group(2)}</rt></ruby>"
+            return base
+        if m.group(0).startswith("（"):  # reading with no kanji/katakana base
+            return m.group(0) if with_furigana else ""
+        return word  # the blank placeholder
+
+    out = _CONTENT_TOKEN_RE.sub(repl, content)
+    if with_furigana:
+        # Strip only non-ruby HTML (e.g. <span>) so Anki can render <ruby>
+        out = _SPAN_RE.sub("", out)
+    else:
+        out = _strip_html(out)
+    return out.strip()
 
 
 def _ja_plain_from_content(content: str, kanji_answer: Optional[str], kana_answer: str) -> str:
@@ -44,14 +158,9 @@ def _ja_plain_from_content(content: str, kanji_answer: Optional[str], kana_answe
     """
     if not content:
         return ""
-    # Replace the blank placeholder with the word (prefer kanji if we have it)
+    # Prefer kanji for the blank if we have it
     word = kanji_answer if kanji_answer else kana_answer
-    content = re.sub(r"<span[^>]*>____</span>", word, content, flags=re.IGNORECASE)
-    content = content.replace("____", word)
-    # Remove furigana in parentheses: 日本（にほん） -> 日本
-    content = re.sub(r"（[^）]+）", "", content)
-    content = _strip_html(content)
-    return content.strip()
+    return _convert_content(content, word, with_furigana=False)
 
 
 def _ja_furigana_from_content(content: str, kanji_answer: Optional[str], kana_answer: str) -> str:
@@ -62,28 +171,7 @@ def _ja_furigana_from_content(content: str, kanji_answer: Optional[str], kana_an
     if not content:
         return ""
     word = kanji_answer if kanji_answer else kana_answer
-    content = re.sub(r"<span[^>]*>____</span>", word, content, flags=re.IGNORECASE)
-    content = content.replace("____", word)
-    # Replace each 漢字（reading） with <ruby>漢字<rt>reading</rt></ruby>
-    # The base is the run of non-space, non-（ characters immediately before （
-    # Base must be kanji or katakana so we don't group particles (の, は) with the word
-    kanji_katakana = r"[\u4e00-\u9fff\u30a0-\u30ff]+"
-    result: List[str] = []
-    i = 0
-    while i < len(content):
-        m = re.match(r"(" + kanji_katakana + r")（([^）]+)）", content[i:])
-        if m:
-            base, reading = m.group(1), m.group(2)
-            result.append(f"<ruby>{base}<rt>{reading}</rt></ruby>")
-            i += len(m.group(0))
-        else:
-            # No match: emit one character and continue (so we reach 学生 in "の学生（がくせい）")
-            result.append(content[i : i + 1])
-            i += 1
-    # Strip only non-ruby HTML (e.g. <span>) so Anki can render <ruby>
-    out = "".join(result)
-    out = re.sub(r"<span[^>]*>.*?</span>", "", out, flags=re.IGNORECASE | re.DOTALL)
-    return out.strip()
+    return _convert_content(content, word, with_furigana=True)
 
 
 def _en_from_translation(translation: str) -> str:
@@ -91,33 +179,28 @@ def _en_from_translation(translation: str) -> str:
     return _strip_html(translation or "").strip()
 
 
-def fetch_vocab(kanji: str) -> Optional[BunproVocab]:
-    """Fetch Bunpro vocab page for the given kanji and parse __NEXT_DATA__.
+def _parse_page_props(payload: bytes) -> Optional[dict]:
+    """Parse the props.pageProps subtree out of __NEXT_DATA__ JSON bytes.
 
-    URL format: https://bunpro.jp/vocabs/<url_encoded_kanji>
-    Returns None if the page fails or doesn't contain vocab data.
+    With ijson installed, only that subtree is materialized; otherwise the
+    whole document is parsed and the rest discarded.
     """
-    encoded = urllib.parse.quote(kanji.strip())
-    url = f"https://bunpro.jp/vocabs/{encoded}"
-    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    if HAS_IJSON:
+        try:
+            for props in ijson.items(io.BytesIO(payload), "props.pageProps"):
+                return props or {}
+        except Exception:
+            pass  # malformed for the streaming parser; retry below
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            html = resp.read().decode("utf-8")
-    except (urllib.error.URLError, OSError):
+        # Both accept raw bytes, so the payload is never decoded to str.
+        data = orjson.loads(payload) if HAS_ORJSON else json.loads(payload)
+    except ValueError:
         return None
+    return data.get("props", {}).get("pageProps", {})
 
-    # Extract __NEXT_DATA__
-    marker = '__NEXT_DATA__" type="application/json">'
-    if marker not in html:
-        return None
-    start = html.index(marker) + len(marker)
-    end = html.index("</script>", start)
-    try:
-        data = json.loads(html[start:end])
-    except json.JSONDecodeError:
-        return None
 
-    page_props = data.get("props", {}).get("pageProps", {})
+def _vocab_from_page_props(kanji: str, page_props: dict) -> Optional[BunproVocab]:
+    """Build a BunproVocab from the props.pageProps subtree, or None if empty."""
     reviewable = page_props.get("reviewable") or {}
     included = page_props.get("included") or {}
     study_questions = included.get("studyQuestions") or []
@@ -150,9 +233,10 @@ def fetch_vocab(kanji: str) -> Optional[BunproVocab]:
                 pos_parts.append(p)
     pos = ", ".join(pos_parts) if pos_parts else ""
 
-    # Examples (at least 2)
+    # Examples: stop at the first 2 usable ones; the ruby conversion is the
+    # expensive part, so only run it once an example is known to be kept.
     examples = []
-    for q in study_questions[:5]:
+    for q in study_questions:
         content = q.get("content") or ""
         translation = q.get("translation") or ""
         answer_kana = q.get("answer") or ""
@@ -160,12 +244,12 @@ def fetch_vocab(kanji: str) -> Optional[BunproVocab]:
         if not content or not translation:
             continue
         ja_plain = _ja_plain_from_content(content, kanji_ans, answer_kana)
-        ja_furigana = _ja_furigana_from_content(content, kanji_ans, answer_kana)
         en = _en_from_translation(translation)
         if ja_plain and en:
+            ja_furigana = _ja_furigana_from_content(content, kanji_ans, answer_kana)
             examples.append((ja_plain, ja_furigana, en))
-        if len(examples) >= 2:
-            break
+            if len(examples) >= 2:
+                break
 
     return BunproVocab(
         kanji=title,
@@ -176,3 +260,260 @@ def fetch_vocab(kanji: str) -> Optional[BunproVocab]:
         jlpt_level=jlpt_level,
         examples=examples,
     )
+
+
+class BunproClient:
+    """Owns the HTTP session and the result caches for Bunpro lookups.
+
+    One shared instance serves the whole add-on, so per-call setup (session,
+    cache handles) is paid once at load time.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None) -> None:
+        if HAS_REQUESTS:
+            self.session = requests.Session()
+            self.session.headers["User-Agent"] = USER_AGENT
+            self.session.mount(
+                "https://",
+                requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16),
+            )
+        else:
+            self.session = None
+        # On-disk cache of parsed results, keyed by kanji, in the add-on
+        # folder; an in-process dict covers repeats within the same session.
+        self._cache_path = cache_path or os.path.join(
+            os.path.dirname(__file__), "bunpro_cache.sqlite"
+        )
+        self._cache_lock = threading.Lock()  # fetches may run from a thread pool
+        self._cache_conn: Optional[sqlite3.Connection] = None
+        self._mem_cache: dict = {}
+
+    # --- caching ---
+
+    def _cache_db(self) -> Optional[sqlite3.Connection]:
+        """Open (once) the SQLite cache, or None if the add-on folder is read-only."""
+        if self._cache_conn is None:
+            try:
+                db = sqlite3.connect(self._cache_path, check_same_thread=False)
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS vocab_cache "
+                    "(kanji TEXT PRIMARY KEY, fetched_at INTEGER, "
+                    "etag TEXT, last_modified TEXT, payload BLOB)"
+                )
+                # Migrate caches created before the validator columns existed.
+                for column in ("etag", "last_modified"):
+                    try:
+                        db.execute(f"ALTER TABLE vocab_cache ADD COLUMN {column} TEXT")
+                    except sqlite3.Error:
+                        pass
+                db.commit()
+                self._cache_conn = db
+            except sqlite3.Error:
+                return None
+        return self._cache_conn
+
+    def _cache_get(self, kanji: str) -> Optional[BunproVocab]:
+        """Return a cached BunproVocab for kanji if present and fresh, else None."""
+        hit = self._mem_cache.get(kanji)
+        if hit is not None:
+            return hit
+        db = self._cache_db()
+        if db is None:
+            return None
+        try:
+            with self._cache_lock:
+                row = db.execute(
+                    "SELECT fetched_at, payload FROM vocab_cache WHERE kanji = ?",
+                    (kanji,),
+                ).fetchone()
+            if not row or time.time() - row[0] >= CACHE_TTL_SECS:
+                return None
+            vocab = pickle.loads(row[1])
+        except (sqlite3.Error, pickle.PickleError, AttributeError):
+            return None
+        self._mem_cache[kanji] = vocab
+        return vocab
+
+    def _cache_get_stale(self, kanji: str) -> Optional[tuple]:
+        """Return (vocab, etag, last_modified) for kanji regardless of freshness.
+
+        Used to revalidate an expired entry with a conditional request.
+        """
+        db = self._cache_db()
+        if db is None:
+            return None
+        try:
+            with self._cache_lock:
+                row = db.execute(
+                    "SELECT payload, etag, last_modified FROM vocab_cache WHERE kanji = ?",
+                    (kanji,),
+                ).fetchone()
+            if not row:
+                return None
+            return pickle.loads(row[0]), row[1], row[2]
+        except (sqlite3.Error, pickle.PickleError, AttributeError):
+            return None
+
+    def _cache_put(
+        self,
+        kanji: str,
+        vocab: BunproVocab,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a successful fetch. Failures are not cached so retries stay possible."""
+        self._mem_cache[kanji] = vocab
+        db = self._cache_db()
+        if db is None:
+            return
+        try:
+            with self._cache_lock:
+                db.execute(
+                    "INSERT OR REPLACE INTO vocab_cache "
+                    "(kanji, fetched_at, etag, last_modified, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (kanji, int(time.time()), etag, last_modified, pickle.dumps(vocab)),
+                )
+                db.commit()
+        except (sqlite3.Error, pickle.PickleError):
+            pass
+
+    def _cache_touch(self, kanji: str) -> None:
+        """Refresh an entry's TTL after the server confirmed it is unchanged."""
+        db = self._cache_db()
+        if db is None:
+            return
+        try:
+            with self._cache_lock:
+                db.execute(
+                    "UPDATE vocab_cache SET fetched_at = ? WHERE kanji = ?",
+                    (int(time.time()), kanji),
+                )
+                db.commit()
+        except sqlite3.Error:
+            pass
+
+    # --- fetching ---
+
+    def _http_get_next_data(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> tuple:
+        """GET the page and return (payload, etag, last_modified, not_modified).
+
+        payload is the raw __NEXT_DATA__ JSON bytes, or None on failure.
+        When validators are passed, the request is conditional; a 304 answer
+        sets not_modified and skips the body entirely. Uses the keep-alive
+        session when requests is available, else a one-shot urllib request.
+        """
+        cond = {}
+        if etag:
+            cond["If-None-Match"] = etag
+        if last_modified:
+            cond["If-Modified-Since"] = last_modified
+        if self.session is not None:
+            try:
+                for attempt in (0, 1):
+                    with self.session.get(
+                        url, headers=cond, timeout=15, stream=True
+                    ) as resp:
+                        if resp.status_code == 304:
+                            return None, etag, last_modified, True
+                        if resp.status_code == 429 and attempt == 0:
+                            time.sleep(_retry_after_secs(resp.headers.get("Retry-After")))
+                            continue
+                        if resp.status_code != 200:
+                            return None, None, None, False
+                        payload = _scan_next_data(resp.iter_content(_CHUNK_SIZE))
+                        return (
+                            payload,
+                            resp.headers.get("ETag"),
+                            resp.headers.get("Last-Modified"),
+                            False,
+                        )
+            except requests.RequestException:
+                return None, None, None, False
+            return None, None, None, False
+        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **cond})
+        for attempt in (0, 1):
+            try:
+                with urllib.request.urlopen(req, timeout=15) as resp:
+                    payload = _scan_next_data(iter(lambda: resp.read(_CHUNK_SIZE), b""))
+                    return (
+                        payload,
+                        resp.headers.get("ETag"),
+                        resp.headers.get("Last-Modified"),
+                        False,
+                    )
+            except urllib.error.HTTPError as e:
+                if e.code == 304:
+                    return None, etag, last_modified, True
+                if e.code == 429 and attempt == 0:
+                    time.sleep(_retry_after_secs(e.headers.get("Retry-After")))
+                    continue
+                return None, None, None, False
+            except (urllib.error.URLError, OSError):
+                return None, None, None, False
+        return None, None, None, False
+
+    def _fetch_uncached(
+        self,
+        kanji: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> tuple:
+        """Fetch the Bunpro vocab page for the given kanji and parse __NEXT_DATA__.
+
+        URL format: https://bunpro.jp/vocabs/<url_encoded_kanji>
+        Returns (vocab, etag, last_modified, not_modified).
+        """
+        encoded = urllib.parse.quote(kanji)
+        url = f"https://bunpro.jp/vocabs/{encoded}"
+        payload, new_etag, new_last_modified, not_modified = self._http_get_next_data(
+            url, etag, last_modified
+        )
+        if not_modified:
+            return None, etag, last_modified, True
+        if payload is None:
+            return None, None, None, False
+        page_props = _parse_page_props(payload)
+        if page_props is None:
+            return None, None, None, False
+        return _vocab_from_page_props(kanji, page_props), new_etag, new_last_modified, False
+
+    def fetch(self, kanji: str) -> Optional[BunproVocab]:
+        """Fetch Bunpro vocab data for the given kanji, using the cache when fresh.
+
+        An expired entry with stored validators is revalidated with a
+        conditional request first; a 304 answer renews it without
+        re-downloading the page. Returns None if the page fails or doesn't
+        contain vocab data.
+        """
+        kanji = kanji.strip()
+        cached = self._cache_get(kanji)
+        if cached is not None:
+            return cached
+        stale = self._cache_get_stale(kanji)
+        etag = stale[1] if stale else None
+        last_modified = stale[2] if stale else None
+        time.sleep(MIN_REQUEST_INTERVAL)
+        vocab, new_etag, new_last_modified, not_modified = self._fetch_uncached(
+            kanji, etag, last_modified
+        )
+        if not_modified and stale is not None:
+            self._cache_touch(kanji)
+            self._mem_cache[kanji] = stale[0]
+            return stale[0]
+        if vocab is not None:
+            self._cache_put(kanji, vocab, new_etag, new_last_modified)
+        return vocab
+
+
+_CLIENT = BunproClient()
+
+
+def fetch_vocab(kanji: str) -> Optional[BunproVocab]:
+    """Fetch Bunpro vocab data for the given kanji via the shared client."""
+    return _CLIENT.fetch(kanji)
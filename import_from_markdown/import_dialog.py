@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional
 
@@ -19,7 +22,7 @@ from aqt.qt import (
     QVBoxLayout,
 )
 from aqt.utils import showWarning, tooltip
-from aqt.operations import QueryOp
+from aqt.operations import CollectionOp
 
 from .parser_md import parse_markdown_folder
 
@@ -36,6 +39,9 @@ FIELD_EX2_JA = "ex2_ja"
 FIELD_EX2_JA_FURIGANA = "ex2_ja_furigana"
 FIELD_EX2_EN = "ex2_en"
 
+# Parallel Bunpro lookups during import (matches the Bunpro add-on's own pool size).
+MAX_BUNPRO_WORKERS = 8
+
 
 def _bunpro_fetch_vocab(kanji: str) -> Optional[Any]:
     try:
@@ -58,40 +64,123 @@ def _note_type_names() -> List[str]:
     return sorted(mw.col.models.all_names())
 
 
+@lru_cache(maxsize=32)
+def _field_index_cached(mid: int, names: tuple) -> dict:
+    return {name: i for i, name in enumerate(names)}
+
+
 def _field_index_by_name(model: dict) -> dict:
-    return {fld["name"]: i for i, fld in enumerate(model.get("flds", []))}
+    # Keyed on the field names too, so renaming a field invalidates the entry.
+    return _field_index_cached(
+        model["id"], tuple(fld["name"] for fld in model.get("flds", []))
+    )
 
 
-def _note_exists_with_kanji(col, model_name: str, kanji: str) -> bool:
-    model = col.models.by_name(model_name)
-    if not model:
-        return False
+def _note_exists_with_kanji(col, model: dict, kanji: str) -> bool:
+    """Fallback duplicate check when _load_existing_kanji is unavailable.
+
+    Queries the notes table directly rather than going through the full
+    find_notes search parser. When the kanji field is the model's sort
+    field, the indexed sfld column gives an exact match in one query.
+    """
     name_to_idx = _field_index_by_name(model)
     kanji_idx = name_to_idx.get(FIELD_KANJI)
     if kanji_idx is None:
         kanji_idx = 0
-    safe_model = model_name.replace('"', '""')
-    escaped = kanji.replace('"', '""')
-    query = f'note:"{safe_model}" "{escaped}"'
+    mid = model["id"]
     try:
-        nids = col.find_notes(query)
+        if kanji_idx == model.get("sortf", 0):
+            return bool(
+                col.db.first(
+                    "select 1 from notes where mid = ? and sfld = ? limit 1",
+                    mid,
+                    kanji,
+                )
+            )
+        pattern = (
+            "%"
+            + kanji.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            + "%"
+        )
+        rows = col.db.list(
+            "select flds from notes where mid = ? and flds like ? escape '\\'",
+            mid,
+            pattern,
+        )
     except Exception:
         return False
-    for nid in nids:
-        note = col.get_note(nid)
-        if kanji_idx < len(note.fields) and note.fields[kanji_idx].strip() == kanji:
+    for flds in rows:
+        fields = flds.split("\x1f")
+        if kanji_idx < len(fields) and fields[kanji_idx].strip() == kanji:
             return True
     return False
 
 
+def _load_existing_kanji(col, model: dict) -> Optional[set]:
+    """Collect the kanji-field value of every existing note of this type.
+
+    One SQL query replaces a find_notes round-trip per imported word.
+    Returns None if the raw query fails so callers can fall back to
+    per-word checks.
+    """
+    kanji_idx = _field_index_by_name(model).get(FIELD_KANJI, 0)
+    try:
+        if kanji_idx == model.get("sortf", 0):
+            # The sort field mirrors the kanji field for this model, so the
+            # sfld column already holds the values; no flds splitting needed.
+            return {
+                str(sfld).strip()
+                for sfld in col.db.list(
+                    "select sfld from notes where mid = ?", model["id"]
+                )
+            }
+        rows = col.db.list("select flds from notes where mid = ?", model["id"])
+    except Exception:
+        return None
+    existing = set()
+    for flds in rows:
+        fields = flds.split("\x1f")
+        if kanji_idx < len(fields):
+            existing.add(fields[kanji_idx].strip())
+    return existing
+
+
+@contextmanager
+def _bulk_transaction(col):
+    """Group many add_note calls into one SQLite transaction when possible.
+
+    Each add_note otherwise pays its own journal flush. BEGIN can be
+    rejected (e.g. the backend already holds a transaction); in that case
+    the import simply runs with per-note commits as before.
+    """
+    began = False
+    try:
+        col.db.execute("BEGIN")
+        began = True
+    except Exception:
+        pass
+    try:
+        yield
+    finally:
+        if began:
+            try:
+                col.db.execute("COMMIT")
+            except Exception:
+                pass
+
+
 def _create_note_from_md(
     col,
-    model_name: str,
-    deck_name: str,
+    model: dict,
+    did: int,
     word: dict,
     use_bunpro: bool,
     name_to_idx: dict,
+    existing: Optional[set] = None,
+    bp_map: Optional[dict] = None,
 ) -> Optional[int]:
+    # Callers must have already checked for duplicates; _run_import filters
+    # against the existing-kanji set before calling.
     kanji = word.get("kanji", "").strip()
     kana = word.get("kana", "").strip()
     meaning = word.get("meaning", "").strip()
@@ -99,12 +188,7 @@ def _create_note_from_md(
     if not kanji and not kana:
         return None
     primary = kanji or kana
-    if _note_exists_with_kanji(col, model_name, primary):
-        return None
 
-    model = col.models.by_name(model_name)
-    if not model:
-        return None
     note = col.new_note(model)
 
     def set_fld(name: str, value: str) -> None:
@@ -113,7 +197,7 @@ def _create_note_from_md(
             note.fields[idx] = value
 
     if use_bunpro:
-        bp = _bunpro_fetch_vocab(primary)
+        bp = bp_map.get(primary) if bp_map is not None else _bunpro_fetch_vocab(primary)
         if bp:
             set_fld(FIELD_KANJI, bp.kanji or primary)
             set_fld(FIELD_KANJI_FURIGANA, bp.kanji or primary)
@@ -149,7 +233,9 @@ def _create_note_from_md(
         set_fld(FIELD_POS, pos)
         set_fld(FIELD_ENGLISH, meaning)
 
-    col.add_note(note, col.decks.id(deck_name))
+    col.add_note(note, did)
+    if existing is not None:
+        existing.add(primary)
     return note.id
 
 
@@ -171,37 +257,58 @@ def _run_import(
     model = col.models.by_name(model_name)
     if not model:
         return 0, 0, f"Note type not found: {model_name}"
+    did = col.decks.id(deck_name)
     name_to_idx = _field_index_by_name(model)
+    existing = _load_existing_kanji(col, model)
+    bp_map: Optional[dict] = None
+    if use_bunpro:
+        # Prefetch all lookups concurrently; the serial per-note fetch would be
+        # dominated by network round-trips.
+        unique = {
+            (word.get("kanji") or word.get("kana") or "").strip() for word in words
+        }
+        unique.discard("")
+        if existing is not None:
+            unique -= existing
+        with ThreadPoolExecutor(max_workers=MAX_BUNPRO_WORKERS) as ex:
+            bp_map = dict(zip(unique, ex.map(_bunpro_fetch_vocab, unique)))
     created = 0
     skipped = 0
     bunpro_ok = 0
     bunpro_fallback = 0
     milestones: List[str] = []
-    for word in words:
-        primary = word.get("kanji") or word.get("kana") or ""
-        if not primary:
-            continue
-        if _note_exists_with_kanji(col, model_name, primary):
-            skipped += 1
-            continue
-        try:
-            before_created = created
-            nid = _create_note_from_md(col, model_name, deck_name, word, use_bunpro, name_to_idx)
-            if nid:
-                created += 1
-                # Rough heuristic for Bunpro usage: if Bunpro is enabled, count every
-                # successfully created note as a Bunpro attempt. We treat failures as
-                # "fallback" when no note was created by _create_note_from_md.
-                if use_bunpro:
-                    bunpro_ok += 1
-            else:
-                if use_bunpro:
-                    bunpro_fallback += 1
-        except Exception:
-            continue
-        # Record milestone messages every 50 created notes
-        if created and created % 50 == 0:
-            milestones.append(f"Progress: created {created} notes so far…")
+    with _bulk_transaction(col):
+        for word in words:
+            primary = word.get("kanji") or word.get("kana") or ""
+            if not primary:
+                continue
+            if existing is not None:
+                if primary in existing:
+                    skipped += 1
+                    continue
+            elif _note_exists_with_kanji(col, model, primary):
+                skipped += 1
+                continue
+            try:
+                before_created = created
+                nid = _create_note_from_md(
+                    col, model, did, word, use_bunpro, name_to_idx, existing, bp_map
+                )
+                if nid:
+                    created += 1
+                    # Rough heuristic for Bunpro usage: if Bunpro is enabled, count every
+                    # successfully created note as a Bunpro attempt. We treat failures as
+                    # "fallback" when no note was created by _create_note_from_md.
+                    if use_bunpro:
+                        bunpro_ok += 1
+                else:
+                    if use_bunpro:
+                        bunpro_fallback += 1
+            except Exception:
+                continue
+            # Record milestone messages every 50 created notes
+            if created and created % 50 == 0:
+                milestones.append(f"Progress: created {created} notes so far…")
     return created, skipped, bunpro_ok, bunpro_fallback, milestones, None
 
 
@@ -209,7 +316,8 @@ class ImportFromMarkdownDialog(QDialog):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Import from Markdown Vocabulary")
-        self._log_lines: List[str] = []
+        self._decks_cached: Optional[List[str]] = None
+        self._models_cached: List[str] = []
         self._build_ui()
         self._bunpro_available = self._check_bunpro()
 
@@ -276,10 +384,15 @@ class ImportFromMarkdownDialog(QDialog):
         self._populate_deck_and_models()
 
     def _populate_deck_and_models(self) -> None:
+        # Sorting the full deck/model lists is wasted work when this runs again
+        # from show_and_exec; a new dialog is built per menu invocation anyway.
+        if self._decks_cached is None:
+            self._decks_cached = _deck_names()
+            self._models_cached = _note_type_names()
         self._deck_combo.clear()
-        self._deck_combo.addItems(_deck_names())
+        self._deck_combo.addItems(self._decks_cached)
         self._note_type_combo.clear()
-        self._note_type_combo.addItems(_note_type_names())
+        self._note_type_combo.addItems(self._models_cached)
         idx = self._note_type_combo.findText("Vocab Front and Back")
         if idx >= 0:
             self._note_type_combo.setCurrentIndex(idx)
@@ -294,11 +407,9 @@ class ImportFromMarkdownDialog(QDialog):
             self._folder_edit.setText(folder)
 
     def _log(self, msg: str) -> None:
-        self._log_lines.append(msg)
-        self._log_edit.setPlainText("\n".join(self._log_lines))
-        self._log_edit.verticalScrollBar().setValue(
-            self._log_edit.verticalScrollBar().maximum()
-        )
+        # appendPlainText is incremental and auto-scrolls; rejoining the whole
+        # buffer per line is quadratic as the log grows.
+        self._log_edit.appendPlainText(msg)
 
     def _on_import(self) -> None:
         folder = self._folder_edit.text().strip()
@@ -319,16 +430,23 @@ class ImportFromMarkdownDialog(QDialog):
             return
 
         self._log_edit.clear()
-        self._log_lines = []
         self._log("Starting import…")
         self._import_btn.setEnabled(False)
 
-        def op(_col) -> tuple:
-            return _run_import(folder, deck, model, use_bunpro)
+        # Imports write notes, so run as a CollectionOp: it marks the op for
+        # undo and refreshes the UI from OpChanges instead of a full mw.reset().
+        result: dict = {}
+
+        def op(col):
+            result["counts"] = _run_import(folder, deck, model, use_bunpro)
+            target = col.add_custom_undo_entry("Import from Markdown")
+            return col.merge_undo_entries(target)
 
-        def on_done(result: tuple) -> None:
+        def on_done(_changes) -> None:
             self._import_btn.setEnabled(True)
-            created, skipped, bunpro_ok, bunpro_fallback, milestones, err = result
+            created, skipped, bunpro_ok, bunpro_fallback, milestones, err = result[
+                "counts"
+            ]
             if err:
                 self._log(f"Error: {err}")
                 showWarning(err)
@@ -341,9 +459,8 @@ class ImportFromMarkdownDialog(QDialog):
                     f"Bunpro lookups: {bunpro_ok} successful, {bunpro_fallback} fell back to markdown data."
                 )
             tooltip(f"Markdown import: {created} created, {skipped} skipped.")
-            mw.reset()
 
-        QueryOp(parent=self, op=op, success=on_done).run_in_background()
+        CollectionOp(parent=self, op=op).success(on_done).run_in_background()
 
     def show_and_exec(self) -> None:
         self._populate_deck_and_models()
@@ -1,39 +1,53 @@
 from __future__ import annotations
 
+import csv
+import io
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, List
 
+# Section extraction is two anchored searches: find a '## Vocabulary'
+# heading, then the next heading, and slice the text between them. This
+# avoids the backtracking a lazy .*? section pattern would do.
+_VOCAB_HEADING_RE = re.compile(r"(?im)^##[ \t]+vocabulary[ \t]*\r?\n")
+_SECTION_BREAK = re.compile(r"^#", re.M)
+_SEPARATOR_CHARS = set("-: ")
 
-def _parse_vocab_table(lines: List[str]) -> List[Dict[str, str]]:
+
+def _parse_section_rows(section: str) -> List[Dict[str, str]]:
     """
-    Given lines starting at the header row of a markdown table, parse rows into
-    dicts with keys: kanji, kana, meaning, type.
+    Parse table rows inside one vocabulary section into dicts with keys:
+    kanji, kana, meaning, pos.
 
     Expected header: | Word | Kanji | Meaning | Type |
     """
     out: List[Dict[str, str]] = []
-    if len(lines) < 2:
-        return out
-
-    header = lines[0].strip().strip("|")
-    cols = [c.strip().lower() for c in header.split("|")]
-    # Basic sanity check on header columns
-    if len(cols) < 3 or cols[0] != "word" or cols[1] != "kanji":
-        return out
-
-    # Skip separator row (---)
-    row_lines = lines[2:]
-    for line in row_lines:
-        line = line.rstrip()
-        if not line.startswith("|"):
-            break
-        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+    in_table = False
+    # The _csv module splits cells in one C-level pass; a '|'-led table row
+    # yields an empty first cell, which distinguishes it from prose lines.
+    reader = csv.reader(io.StringIO(section), delimiter="|", quoting=csv.QUOTE_NONE)
+    for row in reader:
+        if len(row) < 4 or row[0].strip():
+            continue  # not a table row with at least 3 columns
+        cells = row[1:]
+        if not cells[-1].strip():
+            cells = cells[:-1]  # empty tail cell from the trailing pipe
+        cells = [c.strip() for c in cells]
         if len(cells) < 3:
             continue
-        word = cells[0]  # kana / reading (may be empty)
+        word = cells[0]
         kanji = cells[1]
-        meaning = cells[2] if len(cells) > 2 else ""
+        if word.lower() == "word" and kanji.lower() == "kanji":
+            # Header row (of this table, or of a later one in the section)
+            in_table = True
+            continue
+        if not in_table:
+            continue
+        if word and not set(word) - _SEPARATOR_CHARS:
+            continue  # separator row (---)
+        meaning = cells[2]
         pos = cells[3] if len(cells) > 3 else ""
         # Some rows may omit Word or Kanji; treat kanji as primary, falling back to word.
         primary = kanji or word
@@ -52,59 +66,69 @@ def _parse_vocab_table(lines: List[str]) -> List[Dict[str, str]]:
 
 def parse_markdown_file(path: Path) -> List[Dict[str, str]]:
     """
-    Parse a single markdown file for a '## Vocabulary' section and its table.
+    Parse a single markdown file for '## Vocabulary' sections and their tables.
 
     Returns list of dicts: {kanji, kana, meaning, pos}.
     """
-    path = Path(path)
+    # Read via raw os calls: one open/read/close per file, no TextIOWrapper
+    # setup. With thousands of small note files the wrapper overhead adds up.
     try:
-        text = path.read_text(encoding="utf-8")
+        fd = os.open(str(path), os.O_RDONLY)
+        try:
+            data = os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
     except OSError:
         return []
+    text = data.decode("utf-8", "replace")
 
-    lines = text.splitlines()
     results: List[Dict[str, str]] = []
-
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if line.startswith("## ") and line[3:].strip().lower() == "vocabulary":
-            # Collect lines until next heading or EOF
-            section: List[str] = []
-            j = i + 1
-            while j < len(lines):
-                if lines[j].startswith("#") and not lines[j].startswith("## Vocabulary"):
-                    break
-                section.append(lines[j])
-                j += 1
-            # Within section, look for the table header
-            for k, sec_line in enumerate(section):
-                if "| Word |" in sec_line and "| Kanji |" in sec_line:
-                    table_lines = section[k : k + 2 + 100]  # header, separator, up to ~100 rows
-                    results.extend(_parse_vocab_table(table_lines))
-                    break
-            i = j
-        else:
-            i += 1
+    pos = 0
+    while True:
+        heading = _VOCAB_HEADING_RE.search(text, pos)
+        if not heading:
+            break
+        start = heading.end()
+        brk = _SECTION_BREAK.search(text, start)
+        end = brk.start() if brk else len(text)
+        results.extend(_parse_section_rows(text[start:end]))
+        pos = end
     return results
 
 
+def _collect_md_paths(root: str) -> List[str]:
+    """Recursively list *.md files using scandir (one stat per entry)."""
+    paths: List[str] = []
+    try:
+        entries = os.scandir(root)
+    except OSError:
+        return paths
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                paths.extend(_collect_md_paths(entry.path))
+            elif entry.name.lower().endswith(".md"):
+                paths.append(entry.path)
+    return paths
+
+
 def parse_markdown_folder(root: Path) -> List[Dict[str, str]]:
     """
     Walk a folder recursively and collect all vocab entries from *.md files.
     Each entry includes a 'source' key with the markdown file path.
+
+    Files are independent, so they are read and parsed in parallel.
     """
-    root = Path(root)
+    paths = _collect_md_paths(str(root))
+    if not paths:
+        return []
     all_words: List[Dict[str, str]] = []
-    for dirpath, _dirnames, filenames in os.walk(root):
-        for fname in filenames:
-            if not fname.lower().endswith(".md"):
-                continue
-            fpath = Path(dirpath) / fname
-            items = parse_markdown_file(fpath)
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for fpath, items in zip(paths, ex.map(parse_markdown_file, paths)):
             for item in items:
                 item = dict(item)
-                item["source"] = str(fpath)
+                item["source"] = fpath
                 all_words.append(item)
     return all_words
 
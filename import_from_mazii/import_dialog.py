@@ -4,6 +4,9 @@ Import from Mazii dialog: file selection, deck/note type, Bunpro toggle, and imp
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional
 
@@ -25,7 +28,7 @@ from aqt.qt import (
     QVBoxLayout,
 )
 from aqt.utils import showWarning, tooltip
-from aqt.operations import QueryOp
+from aqt.operations import CollectionOp
 
 from .parser import parse_file
 
@@ -44,6 +47,9 @@ FIELD_EX2_EN = "ex2_en"
 
 MAZII_NOTE_URL = "https://mazii.net/en-US/note"
 
+# Parallel Bunpro lookups during import (matches the Bunpro add-on's own pool size).
+MAX_BUNPRO_WORKERS = 8
+
 
 def _bunpro_fetch_vocab(kanji: str) -> Optional[Any]:
     """Return Bunpro data for kanji if the Bunpro add-on is available, else None."""
@@ -66,50 +72,131 @@ def _note_type_names() -> List[str]:
     return sorted(mw.col.models.all_names())
 
 
+@lru_cache(maxsize=32)
+def _field_index_cached(mid: int, names: tuple) -> dict:
+    return {name: i for i, name in enumerate(names)}
+
+
 def _field_index_by_name(model: dict) -> dict:
-    """Return field name -> index for the given note type."""
-    return {fld["name"]: i for i, fld in enumerate(model.get("flds", []))}
+    """Return field name -> index for the given note type.
 
+    Keyed on the field names too, so renaming a field invalidates the entry.
+    """
+    return _field_index_cached(
+        model["id"], tuple(fld["name"] for fld in model.get("flds", []))
+    )
 
-def _note_exists_with_kanji(col, model_name: str, kanji: str) -> bool:
-    """True if a note of this type already has this kanji in the kanji field."""
-    model = col.models.by_name(model_name)
-    if not model:
-        return False
+
+def _note_exists_with_kanji(col, model: dict, kanji: str) -> bool:
+    """True if a note of this type already has this kanji in the kanji field.
+
+    Fallback duplicate check when _load_existing_kanji is unavailable.
+    Queries the notes table directly rather than going through the full
+    find_notes search parser. When the kanji field is the model's sort
+    field, the indexed sfld column gives an exact match in one query.
+    """
     name_to_idx = _field_index_by_name(model)
     kanji_idx = name_to_idx.get(FIELD_KANJI)
     if kanji_idx is None:
         # No kanji field: use first field
         kanji_idx = 0
-    # Search: note type and phrase (kanji). Quote model name and kanji for exact match.
-    safe_model = model_name.replace('"', '""')
-    escaped = kanji.replace('"', '""')
-    query = f'note:"{safe_model}" "{escaped}"'
+    mid = model["id"]
     try:
-        nids = col.find_notes(query)
+        if kanji_idx == model.get("sortf", 0):
+            return bool(
+                col.db.first(
+                    "select 1 from notes where mid = ? and sfld = ? limit 1",
+                    mid,
+                    kanji,
+                )
+            )
+        pattern = (
+            "%"
+            + kanji.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            + "%"
+        )
+        rows = col.db.list(
+            "select flds from notes where mid = ? and flds like ? escape '\\'",
+            mid,
+            pattern,
+        )
     except Exception:
         return False
-    for nid in nids:
-        note = col.get_note(nid)
-        if kanji_idx < len(note.fields) and note.fields[kanji_idx].strip() == kanji:
+    for flds in rows:
+        fields = flds.split("\x1f")
+        if kanji_idx < len(fields) and fields[kanji_idx].strip() == kanji:
             return True
     return False
 
 
+def _load_existing_kanji(col, model: dict) -> Optional[set]:
+    """Collect the kanji-field value of every existing note of this type.
+
+    One SQL query replaces a find_notes round-trip per imported word.
+    Returns None if the raw query fails so callers can fall back to
+    per-word checks.
+    """
+    kanji_idx = _field_index_by_name(model).get(FIELD_KANJI, 0)
+    try:
+        if kanji_idx == model.get("sortf", 0):
+            # The sort field mirrors the kanji field for this model, so the
+            # sfld column already holds the values; no flds splitting needed.
+            return {
+                str(sfld).strip()
+                for sfld in col.db.list(
+                    "select sfld from notes where mid = ?", model["id"]
+                )
+            }
+        rows = col.db.list("select flds from notes where mid = ?", model["id"])
+    except Exception:
+        return None
+    existing = set()
+    for flds in rows:
+        fields = flds.split("\x1f")
+        if kanji_idx < len(fields):
+            existing.add(fields[kanji_idx].strip())
+    return existing
+
+
+@contextmanager
+def _bulk_transaction(col):
+    """Group many add_note calls into one SQLite transaction when possible.
+
+    Each add_note otherwise pays its own journal flush. BEGIN can be
+    rejected (e.g. the backend already holds a transaction); in that case
+    the import simply runs with per-note commits as before.
+    """
+    began = False
+    try:
+        col.db.execute("BEGIN")
+        began = True
+    except Exception:
+        pass
+    try:
+        yield
+    finally:
+        if began:
+            try:
+                col.db.execute("COMMIT")
+            except Exception:
+                pass
+
+
 def _create_note_from_mazii(
     col,
-    model_name: str,
-    deck_name: str,
+    model: dict,
+    did: int,
     word: dict,
     use_bunpro: bool,
     name_to_idx: dict,
+    existing: Optional[set] = None,
+    bp_map: Optional[dict] = None,
 ) -> Optional[int]:
-    """Create one note. Returns note id if created, else None (e.g. duplicate)."""
-    if _note_exists_with_kanji(col, model_name, word["kanji"]):
-        return None
-    model = col.models.by_name(model_name)
-    if not model:
-        return None
+    """Create one note and return its id.
+
+    Callers must have already checked for duplicates; _run_import filters
+    against the existing-kanji set before calling.
+    """
     note = col.new_note(model)
     kanji = word["kanji"]
 
@@ -119,7 +206,7 @@ def _create_note_from_mazii(
             note.fields[idx] = value
 
     if use_bunpro:
-        bp = _bunpro_fetch_vocab(kanji)
+        bp = bp_map.get(kanji) if bp_map is not None else _bunpro_fetch_vocab(kanji)
         if bp:
             set_fld(FIELD_KANJI, kanji)
             set_fld(FIELD_KANJI_FURIGANA, kanji)
@@ -153,7 +240,9 @@ def _create_note_from_mazii(
         set_fld(FIELD_KANA, word.get("kana", ""))
         set_fld(FIELD_ENGLISH, word.get("meaning", ""))
 
-    col.add_note(note, col.decks.id(deck_name))
+    col.add_note(note, did)
+    if existing is not None:
+        existing.add(kanji)
     return note.id
 
 
@@ -176,19 +265,38 @@ def _run_import(
     model = col.models.by_name(model_name)
     if not model:
         return 0, 0, f"Note type not found: {model_name}"
+    did = col.decks.id(deck_name)
     name_to_idx = _field_index_by_name(model)
+    existing = _load_existing_kanji(col, model)
+    bp_map: Optional[dict] = None
+    if use_bunpro:
+        # Prefetch all lookups concurrently; the serial per-note fetch would be
+        # dominated by network round-trips.
+        unique = {word["kanji"] for word in words}
+        unique.discard("")
+        if existing is not None:
+            unique -= existing
+        with ThreadPoolExecutor(max_workers=MAX_BUNPRO_WORKERS) as ex:
+            bp_map = dict(zip(unique, ex.map(_bunpro_fetch_vocab, unique)))
     created = 0
     skipped = 0
-    for word in words:
-        if _note_exists_with_kanji(col, model_name, word["kanji"]):
-            skipped += 1
-            continue
-        try:
-            nid = _create_note_from_mazii(col, model_name, deck_name, word, use_bunpro, name_to_idx)
-            if nid:
-                created += 1
-        except Exception:
-            pass  # skip failed note; could collect and report
+    with _bulk_transaction(col):
+        for word in words:
+            if existing is not None:
+                if word["kanji"] in existing:
+                    skipped += 1
+                    continue
+            elif _note_exists_with_kanji(col, model, word["kanji"]):
+                skipped += 1
+                continue
+            try:
+                nid = _create_note_from_mazii(
+                    col, model, did, word, use_bunpro, name_to_idx, existing, bp_map
+                )
+                if nid:
+                    created += 1
+            except Exception:
+                pass  # skip failed note; could collect and report
     return created, skipped, None
 
 
@@ -196,7 +304,8 @@ class ImportFromMaziiDialog(QDialog):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Import from Mazii")
-        self._log_lines: List[str] = []
+        self._decks_cached: Optional[List[str]] = None
+        self._models_cached: List[str] = []
         self._build_ui()
         self._bunpro_available = self._check_bunpro()
 
@@ -267,10 +376,15 @@ class ImportFromMaziiDialog(QDialog):
         self._populate_deck_and_models()
 
     def _populate_deck_and_models(self) -> None:
+        # Sorting the full deck/model lists is wasted work when this runs again
+        # from show_and_exec; a new dialog is built per menu invocation anyway.
+        if self._decks_cached is None:
+            self._decks_cached = _deck_names()
+            self._models_cached = _note_type_names()
         self._deck_combo.clear()
-        self._deck_combo.addItems(_deck_names())
+        self._deck_combo.addItems(self._decks_cached)
         self._note_type_combo.clear()
-        self._note_type_combo.addItems(_note_type_names())
+        self._note_type_combo.addItems(self._models_cached)
         # Default to "Vocab Front and Back" if present
         idx = self._note_type_combo.findText("Vocab Front and Back")
         if idx >= 0:
@@ -287,9 +401,9 @@ class ImportFromMaziiDialog(QDialog):
             self._path_edit.setText(path)
 
     def _log(self, msg: str) -> None:
-        self._log_lines.append(msg)
-        self._log_edit.setPlainText("\n".join(self._log_lines))
-        self._log_edit.verticalScrollBar().setValue(self._log_edit.verticalScrollBar().maximum())
+        # appendPlainText is incremental and auto-scrolls; rejoining the whole
+        # buffer per line is quadratic as the log grows.
+        self._log_edit.appendPlainText(msg)
 
     def _on_import(self) -> None:
         path = self._path_edit.text().strip()
@@ -310,25 +424,29 @@ class ImportFromMaziiDialog(QDialog):
             return
 
         self._log_edit.clear()
-        self._log_lines = []
         self._log("Starting import…")
         self._import_btn.setEnabled(False)
 
-        def op(_col) -> tuple:
-            return _run_import(path, deck, model, use_bunpro)
+        # Imports write notes, so run as a CollectionOp: it marks the op for
+        # undo and refreshes the UI from OpChanges instead of a full mw.reset().
+        result: dict = {}
+
+        def op(col):
+            result["counts"] = _run_import(path, deck, model, use_bunpro)
+            target = col.add_custom_undo_entry("Import from Mazii")
+            return col.merge_undo_entries(target)
 
-        def on_done(result: tuple) -> None:
+        def on_done(_changes) -> None:
             self._import_btn.setEnabled(True)
-            created, skipped, err = result
+            created, skipped, err = result["counts"]
             if err:
                 self._log(f"Error: {err}")
                 showWarning(err)
                 return
             self._log(f"Done. Created {created} note(s), skipped {skipped} duplicate(s).")
             tooltip(f"Import done: {created} created, {skipped} skipped.")
-            mw.reset()
 
-        QueryOp(parent=self, op=op, success=on_done).run_in_background()
+        CollectionOp(parent=self, op=op).success(on_done).run_in_background()
 
     def show_and_exec(self) -> None:
         self._populate_deck_and_models()
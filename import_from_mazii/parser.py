@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import csv
-import re
 import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -28,6 +27,12 @@ KANJI_HEADERS = ("word", "kanji", "vocabulary", "term", "vocab", "japanese", "ex
 KANA_HEADERS = ("kana", "reading", "readings", "furigana", "hiragana", "phonetic")
 MEANING_HEADERS = ("meaning", "definition", "english", "translation", "gloss", "def", "mean")
 
+# Every header synonym -> our key, resolved with one hashed lookup instead of
+# three tuple scans per header.
+_HEADER_TO_KEY = {h: "kanji" for h in KANJI_HEADERS}
+_HEADER_TO_KEY.update({h: "kana" for h in KANA_HEADERS})
+_HEADER_TO_KEY.update({h: "meaning" for h in MEANING_HEADERS})
+
 
 def _normalize_header(h: str) -> str:
     return (h or "").strip().lower()
@@ -37,13 +42,9 @@ def _detect_columns(headers: List[str]) -> dict:
     """Map our keys (kanji, kana, meaning) to column indices (0-based)."""
     out = {}
     for i, h in enumerate(headers):
-        n = _normalize_header(h)
-        if n in KANJI_HEADERS and "kanji" not in out:
-            out["kanji"] = i
-        elif n in KANA_HEADERS and "kana" not in out:
-            out["kana"] = i
-        elif n in MEANING_HEADERS and "meaning" not in out:
-            out["meaning"] = i
+        key = _HEADER_TO_KEY.get(_normalize_header(h))
+        if key and key not in out:
+            out[key] = i
     return out
 
 
@@ -69,117 +70,127 @@ def parse_csv(path: Path) -> List[dict]:
     """Parse a CSV file. First row is treated as header. Returns list of {kanji, kana?, meaning?}."""
     rows: List[dict] = []
     try:
-        with open(path, "r", encoding="utf-8", newline="") as f:
+        # Stream rows through _row_to_word instead of materializing the whole
+        # file as a list first; the 1 MiB buffer amortizes read syscalls.
+        with open(path, "r", encoding="utf-8", newline="", buffering=1 << 20) as f:
             reader = csv.reader(f)
-            raw_rows = list(reader)
+            headers = next(reader, None)
+            if headers is None:
+                return []
+            col_map = _detect_columns(headers)
+            if not col_map and len(headers) > 0:
+                # No recognized headers: assume first column is kanji
+                col_map = {"kanji": 0}
+                if len(headers) > 1:
+                    col_map["kana"] = 1
+                if len(headers) > 2:
+                    col_map["meaning"] = 2
+            for row in reader:
+                w = _row_to_word(row, col_map)
+                if w:
+                    rows.append(w)
     except Exception:
         return []
-    if not raw_rows:
-        return []
-    headers = raw_rows[0]
-    col_map = _detect_columns(headers)
-    if not col_map and len(headers) > 0:
-        # No recognized headers: assume first column is kanji
-        col_map = {"kanji": 0}
-        if len(headers) > 1:
-            col_map["kana"] = 1
-        if len(headers) > 2:
-            col_map["meaning"] = 2
-    for row in raw_rows[1:]:
-        w = _row_to_word(row, col_map)
-        if w:
-            rows.append(w)
     return rows
 
 
 def _col_from_cell_ref(ref: str) -> int:
     """Convert cell ref (e.g. A1, B2, AA3) to column index 0-based."""
-    match = re.match(r"^([A-Z]+)", ref.upper())
-    if not match:
-        return 0
-    col_str = match.group(1)
+    # Called once per cell; a regex match object per call is the dominant
+    # cost. Letters carry their alphabet position in the low five bits
+    # (case-insensitively), and the first digit ends the column prefix.
     n = 0
-    for c in col_str:
-        n = n * 26 + (ord(c) - ord("A") + 1)
-    return n - 1
+    for c in ref:
+        o = ord(c)
+        if o < 0x41:
+            break
+        n = n * 26 + (o & 0x1F)
+    return n - 1 if n else 0
 
 
 def _read_shared_strings(z: zipfile.ZipFile) -> List[str]:
     """Read xl/sharedStrings.xml and return list of strings (if present)."""
+    uri = NS["main"]
+    si_tag = f"{{{uri}}}si"
+    t_tag = f"{{{uri}}}t"
+    strings: List[str] = []
     try:
         with z.open("xl/sharedStrings.xml") as f:
-            tree = ET.parse(f)
+            # iterparse holds one <si> entry at a time instead of the whole DOM.
+            for _event, si in ET.iterparse(f):
+                if si.tag != si_tag:
+                    continue
+                t_el = si.find(t_tag)
+                if t_el is not None and t_el.text is not None:
+                    strings.append(t_el.text)
+                else:
+                    parts = [el.text or "" for el in si.iter(t_tag)]
+                    strings.append("".join(parts))
+                si.clear()
     except KeyError:
         return []
-    root = tree.getroot()
-    uri = NS["main"]
-    si_tag = f"{{{uri}}}si"
-    t_tag = f"{{{uri}}}t"
-    strings = []
-    for si in root.findall(f".//{si_tag}"):
-        t_el = si.find(t_tag)
-        if t_el is not None and t_el.text is not None:
-            strings.append(t_el.text)
-        else:
-            parts = [el.text or "" for el in si.findall(f".//{t_tag}")]
-            strings.append("".join(parts))
     return strings
 
 
 def _parse_xlsx_stdlib(path: Path) -> List[dict]:
     """Parse first sheet of xlsx using only stdlib (zipfile + xml). Used when openpyxl is missing."""
     rows: List[dict] = []
+    uri = NS["main"]
+    row_tag = f"{{{uri}}}row"
+    c_tag = f"{{{uri}}}c"
+    v_tag = f"{{{uri}}}v"
     try:
         with zipfile.ZipFile(path, "r") as z:
             shared = _read_shared_strings(z)
+            n_shared = len(shared)
+            raw_rows: List[List[str]] = []
             try:
                 with z.open("xl/worksheets/sheet1.xml") as f:
-                    tree = ET.parse(f)
+                    # iterparse keeps a single <row> in memory; a full ET.parse
+                    # materializes the whole sheet before any cell is read.
+                    # Rows arrive in document order, so each can be emitted
+                    # directly, padding gaps left by missing cells.
+                    for _event, row_el in ET.iterparse(f):
+                        if row_el.tag != row_tag:
+                            continue
+                        row_cells: List[str] = []
+                        append_cell = row_cells.append
+                        last_col = -1
+                        # Cells are direct children of <row>; iterating the
+                        # element avoids findall building an intermediate list.
+                        for c_el in row_el:
+                            if c_el.tag != c_tag:
+                                continue
+                            col = _col_from_cell_ref(c_el.get("r", ""))
+                            if col > last_col + 1:
+                                row_cells.extend([""] * (col - last_col - 1))
+                            last_col = col
+                            val_el = c_el.find(v_tag)
+                            if val_el is None:
+                                append_cell("")
+                                continue
+                            raw = (val_el.text or "").strip()
+                            cell_type = c_el.get("t")
+                            if cell_type == "s" and n_shared:
+                                # shared string index
+                                try:
+                                    idx = int(raw)
+                                    append_cell(
+                                        shared[idx].strip() if idx < n_shared else ""
+                                    )
+                                except ValueError:
+                                    append_cell(raw)
+                            else:
+                                # inline string (t="str") or number: use as-is
+                                append_cell(raw)
+                        row_el.clear()
+                        raw_rows.append(row_cells)
             except KeyError:
                 return []
-            root = tree.getroot()
-            uri = NS["main"]
-            row_tag = f"{{{uri}}}row"
-            c_tag = f"{{{uri}}}c"
-            v_tag = f"{{{uri}}}v"
-            grid: dict = {}
-            for row_el in root.findall(f".//{row_tag}"):
-                r = int(row_el.get("r", 0))
-                grid[r] = {}
-                for c_el in row_el.findall(c_tag):
-                    ref = c_el.get("r", "")
-                    col = _col_from_cell_ref(ref)
-                    val_el = c_el.find(v_tag)
-                    if val_el is None:
-                        grid[r][col] = ""
-                    else:
-                        raw = (val_el.text or "").strip()
-                        cell_type = c_el.get("t")
-                        if cell_type == "s" and shared:
-                            # shared string index
-                            try:
-                                idx = int(raw)
-                                grid[r][col] = shared[idx] if idx < len(shared) else ""
-                            except ValueError:
-                                grid[r][col] = raw
-                        else:
-                            # inline string (t="str") or number: use as-is
-                            grid[r][col] = raw
-            if not grid:
-                return []
-            max_row = max(grid.keys())
-            max_col = max(max(grid[r].keys()) for r in grid) if grid else 0
-            raw_rows = []
-            for r in range(1, max_row + 1):
-                raw_rows.append(
-                    [grid.get(r, {}).get(c, "") for c in range(max_col + 1)]
-                )
     except Exception:
         return []
     if not raw_rows:
         return []
-    # Normalize: strip and coerce to str
-    raw_rows = [[str(cell or "").strip() for cell in row] for row in raw_rows]
     headers = raw_rows[0]
     col_map = _detect_columns(headers)
     if not col_map:
@@ -204,24 +215,24 @@ def parse_xlsx(path: Path) -> List[dict]:
             sheet = wb.active
             if not sheet:
                 return []
-            raw_rows = [[str(c.value or "").strip() for c in row] for row in sheet.iter_rows()]
+            # Stream rows instead of materializing the sheet as a list of
+            # lists; values_only also skips Cell object construction.
+            it = sheet.iter_rows(values_only=True)
+            headers = [str(c or "").strip() for c in next(it, ())]
+            col_map = _detect_columns(headers)
+            if not col_map:
+                col_map = {"kanji": 0}
+                if len(headers) > 1:
+                    col_map["kana"] = 1
+                if len(headers) > 2:
+                    col_map["meaning"] = 2
+            for row in it:
+                w = _row_to_word([str(c or "").strip() for c in row], col_map)
+                if w:
+                    rows.append(w)
             wb.close()
         except Exception:
             return _parse_xlsx_stdlib(path)
-        if not raw_rows:
-            return []
-        headers = raw_rows[0]
-        col_map = _detect_columns(headers)
-        if not col_map:
-            col_map = {"kanji": 0}
-            if len(headers) > 1:
-                col_map["kana"] = 1
-            if len(headers) > 2:
-                col_map["meaning"] = 2
-        for row in raw_rows[1:]:
-            w = _row_to_word(row, col_map)
-            if w:
-                rows.append(w)
         return rows
     return _parse_xlsx_stdlib(path)
 
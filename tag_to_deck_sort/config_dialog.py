@@ -20,6 +20,9 @@ from aqt.qt import (
     QPushButton,
     Qt,
     QScrollArea,
+    QStyledItemDelegate,
+    QTableWidget,
+    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
@@ -45,12 +48,12 @@ def _tag_list() -> List[str]:
     return sorted(mw.col.tags.all())
 
 
-def _tag_display_name(normalized_tag: str) -> str:
-    """Return the original-cased tag from the collection if present, else normalized_tag."""
+def _tag_display_name(normalized_tag: str, tags: List[str]) -> str:
+    """Return the original-cased tag from tags if present, else normalized_tag."""
     if not normalized_tag:
         return normalized_tag
     low = normalized_tag.lower()
-    for t in _tag_list():
+    for t in tags:
         if t.lower() == low:
             return t
     return normalized_tag
@@ -72,7 +75,40 @@ def _get_current_config() -> Dict[str, Any]:
 
 def _save_config(cfg: Dict[str, Any]) -> None:
     """Persist config so getConfig() will return it (meta.json)."""
+    from . import _invalidate_config_cache
+
     mw.addonManager.writeConfig(ADDON_MODULE, cfg)
+    _invalidate_config_cache()
+
+
+class _ChoiceDelegate(QStyledItemDelegate):
+    """Edit a table cell with an editable combo over a shared choice list.
+
+    The list is populated only when a cell enters edit mode, so opening the
+    dialog stays O(rows) no matter how many tags/decks the collection has.
+    """
+
+    def __init__(self, choices: List[str], parent=None) -> None:
+        super().__init__(parent)
+        self._choices = choices
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.setEditable(True)
+        combo.addItem("")
+        combo.addItems(self._choices)
+        return combo
+
+    def setEditorData(self, editor, index) -> None:
+        text = index.data() or ""
+        idx = editor.findText(text)
+        if idx >= 0:
+            editor.setCurrentIndex(idx)
+        else:
+            editor.setCurrentText(text)
+
+    def setModelData(self, editor, model, index) -> None:
+        model.setData(index, editor.currentText())
 
 
 class TagDeckConfigDialog(QDialog):
@@ -81,7 +117,11 @@ class TagDeckConfigDialog(QDialog):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Tag → Deck Sort — Config")
-        self._tag_deck_rows: List[tuple] = []  # (row_layout, tag_combo, deck_combo, remove_btn)
+        # Fetch tag and deck lists from the collection once; delegates, row
+        # display names and the protected-deck list all reuse them for the
+        # lifetime of the dialog.
+        self._cached_tags = _tag_list()
+        self._cached_decks = _deck_names()
         self._build_ui()
         self._load_config()
 
@@ -94,8 +134,16 @@ class TagDeckConfigDialog(QDialog):
         map_layout.addWidget(
             QLabel("Each row: when a note has the tag, move its cards to the deck. First row = highest priority if note has multiple tags.")
         )
-        self._mapping_layout = QVBoxLayout()
-        map_layout.addLayout(self._mapping_layout)
+        self._mapping_table = QTableWidget(0, 3)
+        self._mapping_table.setHorizontalHeaderLabels(["Tag", "Deck", ""])
+        self._mapping_table.verticalHeader().setVisible(False)
+        # One delegate per column shares the tag/deck lists across all rows,
+        # instead of two fully-populated combo boxes per mapping row.
+        self._tag_delegate = _ChoiceDelegate(self._cached_tags, self)
+        self._deck_delegate = _ChoiceDelegate(self._cached_decks, self)
+        self._mapping_table.setItemDelegateForColumn(0, self._tag_delegate)
+        self._mapping_table.setItemDelegateForColumn(1, self._deck_delegate)
+        map_layout.addWidget(self._mapping_table)
         row_buttons = QHBoxLayout()
         add_btn = QPushButton("Add mapping")
         add_btn.clicked.connect(self._add_mapping_row)
@@ -131,56 +179,26 @@ class TagDeckConfigDialog(QDialog):
         layout.addWidget(buttons)
 
     def _clear_mapping_rows(self) -> None:
-        for row_layout, tag_combo, deck_combo, remove_btn in self._tag_deck_rows:
-            self._mapping_layout.removeItem(row_layout)
-            row_layout.deleteLater()
-            tag_combo.deleteLater()
-            deck_combo.deleteLater()
-            remove_btn.deleteLater()
-        self._tag_deck_rows.clear()
+        self._mapping_table.setRowCount(0)
 
     def _add_mapping_row(self, tag: str = "", deck: str = "") -> None:
-        tags = _tag_list()
-        decks = _deck_names()
-        tag_combo = QComboBox()
-        tag_combo.setEditable(True)
-        tag_combo.addItem("")
-        tag_combo.addItems(tags)
-        if tag:
-            idx = tag_combo.findText(tag)
-            if idx >= 0:
-                tag_combo.setCurrentIndex(idx)
-            else:
-                tag_combo.setCurrentText(tag)
-        deck_combo = QComboBox()
-        deck_combo.setEditable(True)
-        deck_combo.addItem("")
-        deck_combo.addItems(decks)
-        if deck:
-            idx = deck_combo.findText(deck)
-            if idx >= 0:
-                deck_combo.setCurrentIndex(idx)
-            else:
-                deck_combo.setCurrentText(deck)
+        row = self._mapping_table.rowCount()
+        self._mapping_table.insertRow(row)
+        self._mapping_table.setItem(row, 0, QTableWidgetItem(tag))
+        self._mapping_table.setItem(row, 1, QTableWidgetItem(deck))
         remove_btn = QPushButton("Remove")
-        row_layout = QHBoxLayout()
-        row_layout.addWidget(QLabel("Tag:"))
-        row_layout.addWidget(tag_combo, 1)
-        row_layout.addWidget(QLabel("→ Deck:"))
-        row_layout.addWidget(deck_combo, 1)
-        row_layout.addWidget(remove_btn)
-
-        def on_remove() -> None:
-            self._mapping_layout.removeItem(row_layout)
-            row_layout.deleteLater()
-            tag_combo.deleteLater()
-            deck_combo.deleteLater()
-            remove_btn.deleteLater()
-            self._tag_deck_rows.remove((row_layout, tag_combo, deck_combo, remove_btn))
-
-        remove_btn.clicked.connect(on_remove)
-        self._mapping_layout.addLayout(row_layout)
-        self._tag_deck_rows.append((row_layout, tag_combo, deck_combo, remove_btn))
+        remove_btn.clicked.connect(
+            lambda _=False, btn=remove_btn: self._remove_mapping_row(btn)
+        )
+        self._mapping_table.setCellWidget(row, 2, remove_btn)
+
+    def _remove_mapping_row(self, btn) -> None:
+        # Row indices shift as rows are removed, so locate the row by its
+        # button rather than capturing an index at connect time.
+        for row in range(self._mapping_table.rowCount()):
+            if self._mapping_table.cellWidget(row, 2) is btn:
+                self._mapping_table.removeRow(row)
+                return
 
     def _load_config(self) -> None:
         cfg = _get_current_config()
@@ -197,17 +215,17 @@ class TagDeckConfigDialog(QDialog):
             seen.add(tag_lower)
             deck = mapping.get(tag_lower) or mapping.get(tag) or ""
             # Show original casing from collection in UI; config still stores normalized
-            display_tag = _tag_display_name(tag_lower)
+            display_tag = _tag_display_name(tag_lower, self._cached_tags)
             self._add_mapping_row(tag=display_tag, deck=deck)
         for tag, deck in mapping.items():
             if tag.lower() not in seen:
-                display_tag = _tag_display_name(tag)
+                display_tag = _tag_display_name(tag, self._cached_tags)
                 self._add_mapping_row(tag=display_tag, deck=deck)
 
         # Protected decks
         protected = set(cfg.get("protected_decks") or [])
         self._protected_list.clear()
-        for name in _deck_names():
+        for name in self._cached_decks:
             item = QListWidgetItem(name)
             item.setCheckState(
                 Qt.CheckState.Checked if name in protected else Qt.CheckState.Unchecked
@@ -219,9 +237,11 @@ class TagDeckConfigDialog(QDialog):
     def _on_accept(self) -> None:
         tag_to_deck: Dict[str, str] = {}
         priority: List[str] = []
-        for _, tag_combo, deck_combo, _ in self._tag_deck_rows:
-            tag = (tag_combo.currentText() or "").strip()
-            deck = (deck_combo.currentText() or "").strip()
+        for row in range(self._mapping_table.rowCount()):
+            tag_item = self._mapping_table.item(row, 0)
+            deck_item = self._mapping_table.item(row, 1)
+            tag = (tag_item.text() if tag_item else "").strip()
+            deck = (deck_item.text() if deck_item else "").strip()
             if not tag:
                 continue
             tag_norm = tag.lower()